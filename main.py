@@ -1,27 +1,364 @@
 import argparse
+import functools
+import json
 import os
+import sys
+import tempfile
+from collections.abc import Sequence
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from multiprocessing import get_context
+from typing import TYPE_CHECKING
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pacsv
+import pyarrow.parquet as pq
+
+if TYPE_CHECKING:  # Only for annotations, polars itself is imported on first use by _import_polars
+    import polars as pl
+
+try:
+    import numexpr
+except ImportError:  # numexpr is optional as well
+    numexpr = None
 
 DEFAULT_REPORT_FILENAME = "report.csv"
+ENGINES = ('pandas', 'polars')
+CSV_BLOCK_SIZE = 8 << 20  # bytes handed to each Arrow parser thread
+MAX_READ_WORKERS = min(32, (os.cpu_count() or 1) * 2)
+PROCESS_MIN_FILES = 8  # below either threshold, starting worker processes costs more than it saves
+PROCESS_MIN_BYTES = 100 << 20
+CACHE_FILENAME = ".cache.parquet"
+CACHE_SIGNATURE_KEY = b"stock_signature"
+CACHE_ERRORS_KEY = b"stock_errors"  # messages for the files skipped when the cache was built
+CACHE_FORMAT_VERSION = 1  # bump whenever _optimize_dtypes or the type mapping changes the cached frame
+NUMBA_MIN_ROWS = 100_000  # below this, pandas' own comparison beats the parallel kernel's overhead
+NUMEXPR_MIN_ROWS = 1_000_000  # numexpr's thread start-up only pays off on very large columns
+DEFAULT_COLUMNS = ('name', 'quantity', 'price', 'category')
+# Arrow types given to the parser up front; 'category' is made categorical by _optimize_dtypes
+DEFAULT_DTYPES = {'name': pa.string(), 'quantity': pa.int32(), 'price': pa.float64(), 'category': pa.string()}
+
+@functools.cache
+def _numba_kernels() -> tuple | None:
+    """
+    Import Numba and define the parallel kernels the first time a column is large enough to use them,
+    so small directories never pay for loading Numba. Returns (mask_eq, group_sum_mean, get_num_threads),
+    or None when Numba is not installed and pandas comparisons are used instead.
+    """
+    try:
+        from numba import get_num_threads, njit, prange
+    except ImportError:
+        return None
+
+    @njit(parallel=True, cache=True)
+    def _mask_eq(values, target):
+        """
+        Compare every element of a numeric array with target across all cores.
+        """
+        out = np.empty(values.shape[0], np.bool_)
+        for i in prange(values.shape[0]):
+            out[i] = values[i] == target
+        return out
+
+    @njit(parallel=True, cache=True)
+    def _group_sum_mean(codes, quantities, prices, n_groups, n_chunks):
+        """
+        Per-group quantity sums, price sums and row counts in two passes: every one of the
+        n_chunks threads accumulates its own slice into private rows, which are then added together.
+        """
+        chunk = (codes.shape[0] + n_chunks - 1) // n_chunks
+        partial_q = np.zeros((n_chunks, n_groups), quantities.dtype)
+        partial_p = np.zeros((n_chunks, n_groups), np.float64)
+        partial_c = np.zeros((n_chunks, n_groups), np.int64)
+        for t in prange(n_chunks):
+            for i in range(t * chunk, min((t + 1) * chunk, codes.shape[0])):
+                k = codes[i]
+                if k >= 0:  # -1 marks a missing category, which groupby drops as well
+                    partial_q[t, k] += quantities[i]
+                    partial_p[t, k] += prices[i]
+                    partial_c[t, k] += 1
+        return partial_q.sum(axis=0), partial_p.sum(axis=0), partial_c.sum(axis=0)
+
+    return _mask_eq, _group_sum_mean, get_num_threads
+
+def _safe_read(path: str, block_size: int = CSV_BLOCK_SIZE, columns: list | None = None,
+               dtypes: dict | None = None) -> tuple[pa.Table | None, str | None]:
+    """
+    Stream a single CSV file into an Arrow table, one block_size batch at a time,
+    returning (None, error message) on failure so the caller can report it.
+    Only the given columns are converted, with the given Arrow types instead of inferred ones;
+    those the file's header lacks are left out rather than rejecting the file.
+    """
+    read_options = pacsv.ReadOptions(use_threads=True, block_size=block_size)
+    convert_options = pacsv.ConvertOptions(include_columns=columns, include_missing_columns=True,
+                                           column_types=dtypes)
+    try:
+        if columns is not None:
+            with open(path, 'rb') as f:
+                # Parse the header line alone, to tell the declared columns from the null-filled ones
+                declared = set(pacsv.read_csv(pa.py_buffer(f.readline())).column_names)
+        with pacsv.open_csv(path, read_options=read_options, convert_options=convert_options) as reader:
+            table = pa.Table.from_batches(list(reader), schema=reader.schema)
+        if columns is not None:
+            table = table.select([column for column in columns if column in declared])
+        return table, None
+    except Exception as e:
+        return None, f"Error reading {os.path.basename(path)}: {e}"
+
+def _optimize_dtypes(dataframe: pd.DataFrame) -> pd.DataFrame:
+    """
+    Downcast numeric columns and turn low-cardinality text columns into categoricals to shrink memory.
+    """
+    for column in dataframe.columns:
+        series = dataframe[column]
+        if pd.api.types.is_integer_dtype(series):
+            dataframe[column] = pd.to_numeric(series, downcast='integer')
+        elif pd.api.types.is_float_dtype(series):
+            downcast = pd.to_numeric(series, downcast='float')
+            if downcast.astype(series.dtype).equals(series):  # Only when no precision is lost (prices)
+                dataframe[column] = downcast
+        elif pd.api.types.is_string_dtype(series) and (
+                column == 'category' or series.nunique() < 0.5 * len(series)):
+            # 'category' is always the summary group key, so its codes are worth having regardless
+            dataframe[column] = series.astype('category')
+    return dataframe
+
+def _directory_signature(directory: str) -> tuple:
+    """
+    Describe the CSV files of a directory as sorted (path, mtime_ns, size) tuples,
+    which changes whenever a file is added, removed or rewritten.
+    """
+    signature = []
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            # DirEntry carries the file type from the directory listing, so only CSV files get a stat call
+            if entry.name.endswith(".csv") and entry.is_file():
+                stat = entry.stat()
+                signature.append((entry.path, stat.st_mtime_ns, stat.st_size))
+    return tuple(sorted(signature))
+
+def _encode_signature(signature: tuple, columns: tuple | None, dtypes: tuple | None) -> bytes:
+    """
+    Serialize a directory signature and the parse options for the Parquet cache,
+    independently of how the directory was spelled.
+    """
+    return json.dumps({
+        'version': CACHE_FORMAT_VERSION,
+        'files': [[os.path.basename(path), mtime, size] for path, mtime, size in signature],
+        'columns': columns,
+        'dtypes': dtypes and [[column, str(dtype)] for column, dtype in dtypes]
+    }).encode()
+
+def _read_parquet_cache(cache_file: str, key: bytes) -> tuple[pd.DataFrame, tuple] | None:
+    """
+    Load the Parquet cache and the errors recorded with it if it was written under exactly this key,
+    otherwise return None.
+    """
+    try:
+        metadata = pq.read_schema(cache_file).metadata or {}
+        if metadata.get(CACHE_SIGNATURE_KEY) != key:
+            return None
+        table = pq.read_table(cache_file)
+    except (OSError, pa.ArrowException):
+        return None  # Missing or unreadable cache, rebuild it from the CSV files
+    errors = tuple(json.loads(metadata.get(CACHE_ERRORS_KEY, b"[]")))
+    # Dictionary columns come back as categoricals, everything else stays Arrow-backed
+    dataframe = table.to_pandas(types_mapper=lambda t: None if pa.types.is_dictionary(t) else pd.ArrowDtype(t))
+    for field in table.schema:
+        if pa.types.is_dictionary(field.type):
+            # Give the categories the Arrow-backed dtype they had when the frame was parsed
+            values = dataframe[field.name].array
+            categories = values.categories.astype(pd.ArrowDtype(field.type.value_type))
+            dataframe[field.name] = pd.Categorical.from_codes(values.codes, categories, ordered=values.ordered)
+    return dataframe, errors
+
+def _write_parquet_cache(cache_file: str, key: bytes, dataframe: pd.DataFrame, errors: tuple) -> None:
+    """
+    Persist the consolidated data next to the CSV files so later runs can skip parsing,
+    along with the errors of the skipped files so those runs still report them.
+    """
+    table = pa.Table.from_pandas(dataframe, preserve_index=False)
+    table = table.replace_schema_metadata({**table.schema.metadata, CACHE_SIGNATURE_KEY: key,
+                                           CACHE_ERRORS_KEY: json.dumps(errors).encode()})
+    try:
+        # Write a temporary file beside the cache and rename it into place, so that concurrent runs
+        # or a crash mid-write never leave a truncated cache for the next run to load
+        fd, tmp_file = tempfile.mkstemp(prefix=CACHE_FILENAME + ".", suffix=".tmp",
+                                        dir=os.path.dirname(cache_file) or ".")
+    except OSError:
+        return  # Read-only directory, the cache is only an optimization
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            pq.write_table(table, f, compression='zstd')
+        os.chmod(tmp_file, 0o644)  # mkstemp creates the file readable by its owner only
+        os.replace(tmp_file, cache_file)
+    except OSError:
+        try:
+            os.unlink(tmp_file)
+        except FileNotFoundError:
+            pass
+
+@functools.lru_cache(maxsize=4)
+def _consolidate_cached(directory: str, signature: tuple, block_size: int,
+                        columns: tuple | None, dtypes: tuple | None) -> tuple[pd.DataFrame, tuple]:
+    """
+    Parse and merge the files described by signature; memoized so unchanged directories are read once,
+    and persisted as Parquet so other processes can reuse the result.
+    Returns the frame with the error messages of the files that were skipped.
+
+    Raises:
+        ValueError: If no CSV files could be read.
+    """
+    cache_file = os.path.join(directory, CACHE_FILENAME)
+    cache_key = _encode_signature(signature, columns, dtypes)
+    if signature:
+        cached = _read_parquet_cache(cache_file, cache_key)
+        if cached is not None:
+            return cached
+
+    paths = [path for path, _, _ in signature]
+
+    options = ([block_size] * len(paths), [columns and list(columns)] * len(paths),
+               [dtypes and dict(dtypes)] * len(paths))
+    if len(paths) > PROCESS_MIN_FILES and sum(size for _, _, size in signature) > PROCESS_MIN_BYTES:
+        # Huge directories: parse in separate interpreters so per-file Python work does not contend on the GIL
+        with ProcessPoolExecutor(max_workers=os.cpu_count(), mp_context=get_context("spawn")) as executor:
+            results = list(executor.map(_safe_read, paths, *options, chunksize=4))
+    else:
+        # Arrow releases the GIL while parsing, so files are read concurrently
+        with ThreadPoolExecutor(max_workers=MAX_READ_WORKERS) as executor:
+            results = list(executor.map(_safe_read, paths, *options))
+
+    tables = []
+    errors = []
+    schema = None
+    for path, (table, error) in zip(paths, results):
+        if table is None:
+            errors.append(error)
+            continue
+        try:
+            # Reject files whose columns cannot be merged with what was read so far
+            schema = table.schema if schema is None else pa.unify_schemas(
+                [schema, table.schema], promote_options="permissive")
+            tables.append(table)
+        except pa.ArrowException as e:
+            errors.append(f"Error reading {os.path.basename(path)}: {e}")
+    if not tables:
+        for error in errors:
+            print(error)
+        raise ValueError("No valid CSV files found.")
+    combined = pa.concat_tables(tables, promote_options="permissive")
+    del tables, results
+    if columns is not None:
+        # Files lacking a column are null-filled by the merge, which appends it; restore the requested order
+        combined = combined.select([column for column in columns if column in combined.column_names])
+    # Release each Arrow column as soon as it has been converted instead of holding both copies
+    dataframe = _optimize_dtypes(
+        combined.to_pandas(types_mapper=pd.ArrowDtype, split_blocks=True, self_destruct=True))
+    errors = tuple(errors)
+    _write_parquet_cache(cache_file, cache_key, dataframe, errors)
+    return dataframe, errors
+
+def _copy_on_write() -> bool:
+    # Always on from pandas 3; opt-in through mode.copy_on_write on pandas 2
+    return int(pd.__version__.split('.')[0]) >= 3 or pd.get_option("mode.copy_on_write") is True
 
-def consolidate_csv_files(directory: str) -> pd.DataFrame:
+def consolidate_csv_files(directory: str, block_size: int = CSV_BLOCK_SIZE,
+                          columns: Sequence[str] | None = DEFAULT_COLUMNS,
+                          dtypes: dict | None = DEFAULT_DTYPES) -> pd.DataFrame:
     """
     Consolidate all CSV files in the specified directory into a single DataFrame.
+    Files are parsed in batches of block_size bytes to bound peak memory, and the
+    result is reused until one of the files changes. Only the given columns are read,
+    with the given Arrow types; pass None to read every column or to infer types.
 
     Raises:
         ValueError: If no CSV files are found in the directory.
     """
-    all_data = []
-    for file in os.listdir(directory):
-        if file.endswith(".csv"):
-            try:
-                df = pd.read_csv(os.path.join(directory, file))
-                all_data.append(df)
-            except Exception as e:
-                print(f"Error reading {file}: {e}")  # Explicitly print the error message
-    if not all_data:
-        raise ValueError("No valid CSV files found.")
-    return pd.concat(all_data, ignore_index=True)
+    columns = tuple(columns) if columns is not None else None
+    dtypes = tuple(sorted(dtypes.items())) if dtypes is not None else None
+    dataframe, errors = _consolidate_cached(directory, _directory_signature(directory), block_size,
+                                            columns, dtypes)
+    for error in errors:
+        print(error)  # Reported on every call, including cache hits, so skipped files are never silent
+    # Callers must never alter the cached frame: a shallow copy suffices under copy-on-write only
+    return dataframe.copy(deep=not _copy_on_write())
+
+def _is_number_dtype(dtype) -> bool:
+    return pd.api.types.is_numeric_dtype(dtype) and not pd.api.types.is_bool_dtype(dtype)
+
+def _to_mask(result) -> np.ndarray:
+    """
+    Turn a comparison result into a plain boolean array, missing values counting as no match.
+    """
+    if isinstance(result, np.ndarray):
+        return result
+    return result.to_numpy(dtype=bool, na_value=False)
+
+def _match_number(values, search_value: str) -> np.ndarray:
+    """
+    Compare a numeric array with search_value converted once, instead of converting every cell to a string.
+    """
+    try:
+        target = pd.to_numeric(search_value)
+    except ValueError:
+        return np.zeros(len(values), dtype=bool)
+    if isinstance(target, int) and not np.iinfo(np.int64).min <= target <= np.iinfo(np.uint64).max:
+        target = float(target)  # Wider than any integer dtype: only a float column can still hold it
+    try:
+        if not values.isna().any():
+            if len(values) >= NUMBA_MIN_ROWS and (kernels := _numba_kernels()) is not None:
+                mask_eq, _, _ = kernels
+                return mask_eq(values.to_numpy(), target)
+            if numexpr is not None and len(values) >= NUMEXPR_MIN_ROWS:
+                return numexpr.evaluate("values == target",
+                                        local_dict={'values': values.to_numpy(), 'target': target})
+        return _to_mask(values == target)
+    except (OverflowError, TypeError):
+        return np.zeros(len(values), dtype=bool)  # target cannot be represented in the column's dtype
+
+@functools.singledispatch
+def _match(values, search_value: str) -> np.ndarray:
+    """
+    Boolean mask of the elements of a column's array equal to search_value, specialized per array layout.
+    This fallback (booleans, dates, mixed objects) compares the text form of every element.
+    """
+    return (pd.Series(values, copy=False).astype(str) == search_value).to_numpy(dtype=bool, na_value=False)
+
+@_match.register
+def _(values: pd.arrays.NumpyExtensionArray, search_value: str) -> np.ndarray:
+    if _is_number_dtype(values.dtype):
+        return _match_number(values, search_value)
+    if pd.api.types.is_string_dtype(values):
+        # Python string objects: a hashed lookup avoids calling str.__eq__ once per row
+        return values.isin([search_value])
+    return _match.dispatch(object)(values, search_value)
+
+@_match.register
+def _(values: pd.arrays.ArrowExtensionArray, search_value: str) -> np.ndarray:
+    if _is_number_dtype(values.dtype):
+        return _match_number(values, search_value)
+    if pd.api.types.is_string_dtype(values.dtype):
+        return _to_mask(values == search_value)  # Runs as pyarrow.compute.equal
+    return _match.dispatch(object)(values, search_value)
+
+@_match.register(pd.arrays.IntegerArray)
+@_match.register(pd.arrays.FloatingArray)
+def _(values, search_value: str) -> np.ndarray:
+    return _match_number(values, search_value)
+
+@_match.register
+def _(values: pd.Categorical, search_value: str) -> np.ndarray:
+    # Look the value up once among the categories, then compare small integer codes instead of strings
+    categories = values.categories
+    if not pd.api.types.is_string_dtype(categories.dtype):
+        # Non-text categories (numbers, dates) are matched on their text form, which may be shared by several
+        return np.isin(values.codes, np.flatnonzero(categories.astype(str) == search_value))
+    try:
+        code = categories.get_loc(search_value)
+    except KeyError:
+        return np.zeros(len(values), dtype=bool)
+    return values.codes == code
 
 def search_data(dataframe: pd.DataFrame, column: str, search_value: str) -> pd.DataFrame:
     """
@@ -33,32 +370,163 @@ def search_data(dataframe: pd.DataFrame, column: str, search_value: str) -> pd.D
     if column not in dataframe.columns:
         raise KeyError(f"Column '{column}' not found in the DataFrame.")
 
-    return dataframe[dataframe[column].astype(str) == search_value]
+    if _is_polars(dataframe):
+        return _search_polars(dataframe, column, search_value)
+    return dataframe[_match(dataframe[column].array, search_value)]
 
-def generate_summary_report(dataframe: pd.DataFrame, output_file: str = DEFAULT_REPORT_FILENAME) -> None:
+def _aggregate_by_category(dataframe: pd.DataFrame) -> pd.DataFrame:
     """
-    Generate a summary report grouped by category, showing total quantity and average price.
+    Total quantity and average price per category, sorted by category.
 
     Raises:
         KeyError: If required columns are missing in the DataFrame.
-        Exception: If an error occurs during report generation.
     """
-    try:
-        summary = dataframe.groupby('category').agg({
+    categories, quantities, prices = dataframe['category'], dataframe['quantity'], dataframe['price']
+    if (len(dataframe) < NUMBA_MIN_ROWS or quantities.hasnans or prices.hasnans
+            or not pd.api.types.is_numeric_dtype(quantities) or not pd.api.types.is_numeric_dtype(prices)
+            or (kernels := _numba_kernels()) is None):
+        return dataframe.groupby('category', observed=True).agg({
             'quantity': 'sum',
             'price': 'mean'
         }).rename(columns={
             'quantity': 'Total Quantity',
             'price': 'Average Price'
         })
-        summary['Average Price'] = summary['Average Price'].round(2)
-        summary.to_csv(output_file)
+
+    if isinstance(categories.dtype, pd.CategoricalDtype):
+        codes, uniques = categories.cat.codes.to_numpy(), categories.cat.categories
+    else:
+        codes, uniques = pd.factorize(categories, sort=True)
+    accumulator = np.int64 if pd.api.types.is_integer_dtype(quantities) else np.float64
+    _, group_sum_mean, get_num_threads = kernels
+    total_q, total_p, counts = group_sum_mean(
+        codes, quantities.to_numpy(accumulator), prices.to_numpy(np.float64), len(uniques), get_num_threads())
+    observed = counts > 0
+    return pd.DataFrame({
+        'Total Quantity': total_q[observed],
+        'Average Price': total_p[observed] / counts[observed]
+    }, index=pd.Index(uniques[observed], name='category'))
+
+def generate_summary_report(dataframe: pd.DataFrame, output_file: str = DEFAULT_REPORT_FILENAME) -> None:
+    """
+    Generate a summary report grouped by category, showing total quantity and average price.
+
+    Raises:
+        KeyError: If required columns are missing in the DataFrame.
+        Exception: If an error occurs during report generation.
+    """
+    try:
+        if _is_polars(dataframe):
+            summary = _summary_polars(dataframe)
+        else:
+            summary = _aggregate_by_category(dataframe)
+        table = pa.Table.from_pandas(summary.reset_index(), preserve_index=False)
+        # Format the few averages to cents like to_csv(float_format='%.2f'), missing ones as empty cells
+        averages = table['Average Price'].to_numpy(zero_copy_only=False).astype(np.float64)
+        prices = table.schema.get_field_index('Average Price')
+        table = table.set_column(prices, 'Average Price',
+                                 pa.array(np.char.mod('%.2f', averages), mask=np.isnan(averages)))
+        try:
+            # Same bytes as to_csv: a plain header line, then Arrow's C++ writer for the unquoted cells
+            with open(output_file, 'wb') as f:
+                f.write((','.join(table.column_names) + '\n').encode())
+                pacsv.write_csv(table, f, write_options=pacsv.WriteOptions(include_header=False,
+                                                                           quoting_style="none"))
+        except pa.ArrowInvalid:
+            # A category containing a comma, quote or newline: let pandas quote just those cells
+            summary.to_csv(output_file, float_format='%.2f')
         print(f"Summary report saved to {output_file}")
     except KeyError as e:
         print(f"Missing required column in data: {e}")
     except Exception as e:
         print(f"Error generating summary report: {e}")
 
+def _import_polars():
+    """
+    Import polars on first use only, so the pandas engine does not pay for loading it.
+
+    Raises:
+        ImportError: If polars is not installed.
+    """
+    try:
+        import polars
+    except ImportError as e:
+        raise ImportError("The polars engine requires the 'polars' package.") from e
+    return polars
+
+def _is_polars(dataframe) -> bool:
+    # A polars frame can only exist once polars has been imported
+    pl = sys.modules.get('polars')
+    return pl is not None and isinstance(dataframe, pl.DataFrame)
+
+def _consolidate_polars(directory: str) -> "pl.DataFrame":
+    """
+    Polars counterpart of consolidate_csv_files: each CSV file is scanned with the DEFAULT_DTYPES types,
+    unreadable files are reported and skipped, and the default columns a file lacks are filled with nulls
+    when another file declares them.
+
+    Raises:
+        ImportError: If polars is not installed.
+        ValueError: If no CSV files are found in the directory.
+    """
+    pl = _import_polars()
+    schema = pl.from_arrow(pa.schema(list(DEFAULT_DTYPES.items())).empty_table()).schema
+    frames = []
+    for path, _, _ in _directory_signature(directory):
+        try:
+            # Explicit paths with glob=False, so directory names containing [ or * are not expanded
+            scan = pl.scan_csv(path, schema_overrides=schema, glob=False)
+            present = scan.collect_schema().names()
+            frames.append(scan.select([column for column in DEFAULT_COLUMNS if column in present])
+                          .collect(engine='streaming'))
+        except Exception as e:
+            # Polars appends multi-line hints to parse errors, the first line is the message itself
+            print(f"Error reading {os.path.basename(path)}: {str(e).splitlines()[0]}")
+    if not frames:
+        raise ValueError("No valid CSV files found.")
+    # Diagonal concatenation null-fills the columns a file lacks; columns no file declares stay absent
+    combined = pl.concat(frames, how='diagonal')
+    return combined.select([column for column in DEFAULT_COLUMNS if column in combined.columns])
+
+def _search_polars(dataframe: "pl.DataFrame", column: str, search_value: str) -> "pl.DataFrame":
+    """
+    Polars counterpart of the search_data comparison.
+    """
+    pl = _import_polars()
+    dtype = dataframe.schema[column]
+    if dtype.is_numeric():
+        try:
+            target = pd.to_numeric(search_value)
+        except ValueError:
+            return dataframe.clear()
+        return dataframe.filter(pl.col(column) == target)
+    if dtype == pl.String:
+        return dataframe.filter(pl.col(column) == search_value)
+    return dataframe.filter(pl.col(column).cast(pl.String) == search_value)
+
+def _summary_polars(dataframe: "pl.DataFrame") -> pd.DataFrame:
+    """
+    Polars counterpart of _aggregate_by_category; only the tiny result is converted to pandas for writing.
+
+    Raises:
+        KeyError: If required columns are missing in the DataFrame.
+    """
+    pl = _import_polars()
+    for column in ('category', 'quantity', 'price'):
+        if column not in dataframe.columns:
+            raise KeyError(column)
+    summary = dataframe.group_by('category').agg([
+        pl.col('quantity').sum().alias('Total Quantity'),
+        pl.col('price').mean().alias('Average Price')
+    ]).sort('category')
+    return summary.to_pandas().set_index('category')
+
+_MENU_BANNER = """Welcome to the Stock Management Tool
+1. Consolidate CSV Files
+2. Search Data
+3. Generate Summary Report
+4. Exit"""
+
 def interactive_menu() -> None:
     """
     Interactive menu for the Stock Management Tool.
@@ -66,11 +534,7 @@ def interactive_menu() -> None:
     Raises:
         Exception: If an error occurs during any operation in the interactive menu.
     """
-    print("Welcome to the Stock Management Tool")
-    print("1. Consolidate CSV Files")
-    print("2. Search Data")
-    print("3. Generate Summary Report")
-    print("4. Exit")
+    print(_MENU_BANNER)
 
     data = None
 
@@ -121,13 +585,10 @@ def interactive_menu() -> None:
         else:
             print("Invalid choice. Please try again.")
 
-def main(args=None):
+def _build_parser() -> argparse.ArgumentParser:
+    """
+    Build the command-line parser with one subcommand per feature.
     """
-        Main function to handle command-line arguments and execute the corresponding functionality.
-
-        Raises:
-            Exception: If an error occurs in any command execution.
-        """
     parser = argparse.ArgumentParser(description="Stock Management Tool")
     subparsers = parser.add_subparsers(dest='command', required=True)
 
@@ -137,33 +598,52 @@ def main(args=None):
     # Consolidate command
     consolidate_parser = subparsers.add_parser('consolidate', help="Consolidate CSV files")
     consolidate_parser.add_argument('--directory', required=True, help="Directory containing CSV files")
+    consolidate_parser.add_argument('--engine', choices=ENGINES, default='pandas', help="Data frame library to use")
 
     # Search command
     search_parser = subparsers.add_parser('search', help="Search data in consolidated CSV")
     search_parser.add_argument('--directory', required=True, help="Directory containing CSV files")
     search_parser.add_argument('--column', required=True, help="Column to search")
     search_parser.add_argument('--value', required=True, help="Value to search for in the column")
+    search_parser.add_argument('--engine', choices=ENGINES, default='pandas', help="Data frame library to use")
 
     # Summary command
     summary_parser = subparsers.add_parser('summary', help="Generate summary report")
     summary_parser.add_argument('--directory', required=True, help="Directory containing CSV files")
     summary_parser.add_argument('--output', default=DEFAULT_REPORT_FILENAME, help="Output file for summary report")
+    summary_parser.add_argument('--engine', choices=ENGINES, default='pandas', help="Data frame library to use")
+
+    return parser
 
-    parsed_args = parser.parse_args(args)
+# Built once at import so repeated main() calls (scripts, tests) only parse
+_PARSER = _build_parser()
+
+def main(args=None):
+    """
+        Main function to handle command-line arguments and execute the corresponding functionality.
+
+        Raises:
+            Exception: If an error occurs in any command execution.
+        """
+    parsed_args = _PARSER.parse_args(args)
+    if getattr(parsed_args, 'engine', 'pandas') == 'polars':
+        consolidate = _consolidate_polars  # search_data and generate_summary_report accept its frames
+    else:
+        consolidate = consolidate_csv_files
 
     if parsed_args.command == 'interactive':
         interactive_menu()
     elif parsed_args.command == 'consolidate':
         try:
-            df = consolidate_csv_files(parsed_args.directory)
+            df = consolidate(parsed_args.directory)
             print("CSV files consolidated successfully.")
         except Exception as e:
             print(f"Error: {e}")
     elif parsed_args.command == 'search':
         try:
-            df = consolidate_csv_files(parsed_args.directory)
+            df = consolidate(parsed_args.directory)
             results = search_data(df, parsed_args.column, parsed_args.value)
-            if results.empty:
+            if len(results) == 0:
                 print("No matching records found.")
             else:
                 print("Search Results:")
@@ -172,7 +652,7 @@ def main(args=None):
             print(f"Error: {e}")
     elif parsed_args.command == 'summary':
         try:
-            df = consolidate_csv_files(parsed_args.directory)
+            df = consolidate(parsed_args.directory)
             generate_summary_report(df, parsed_args.output)
         except Exception as e:
             print(f"Error: {e}")
@@ -1,21 +1,198 @@
+import atexit
+import functools
+import importlib.util
 import os
+import re
+import shutil
+import tempfile
 import pandas as pd
+import pyarrow as pa
 import unittest
-from main import consolidate_csv_files, search_data, generate_summary_report, main
-from unittest.mock import patch
+import main as main_module
+from main import consolidate_csv_files, search_data, generate_summary_report, main, _consolidate_cached
+from unittest.mock import DEFAULT, MagicMock, patch
 import io
+import contextlib
 from argparse import Namespace
 
+@contextlib.contextmanager
+def capture_stdout():
+    """Redirect stdout into a fresh StringIO for the duration of the block."""
+    buf = io.StringIO()
+    with contextlib.redirect_stdout(buf):
+        yield buf
+
+
+class NeedleSink(io.TextIOBase):
+    """Stdout replacement that keeps a short rolling tail and records which needles have been printed."""
+
+    def __init__(self, needles=()):
+        super().__init__()
+        self.needles = list(needles)
+        self.reset()
+
+    def reset(self, *needles):
+        if needles:
+            self.needles = list(needles)
+        self.found = set()
+        self.tail = ""
+
+    def writable(self):
+        return True
+
+    def write(self, s):
+        if len(self.found) == len(self.needles):
+            return len(s)
+        self.tail = (self.tail + s)[-4096:]
+        for needle in self.needles:
+            if needle not in self.found and needle in self.tail:
+                self.found.add(needle)
+        return len(s)
+
+
+# Same content as the CSV/ sample directory, written to a scratch directory for the test run
+_FIXTURE_FILES = {
+    "clothing.csv": (
+        b"name,quantity,price,category\n"
+        b"T-shirt,90,14.99,Clothing\n"
+        b"Jeans,60,39.99,Clothing\n"
+        b"Jacket,30,79.99,Clothing\n"
+    ),
+    "electronics.csv": (
+        b"name,quantity,price,category\n"
+        b"Laptop,50,899.99,Electronics\n"
+        b"Smartphone,120,699.99,Electronics\n"
+        b"Tablet,75,499.99,Electronics\n"
+    ),
+    "furniture.csv": (
+        b"name,quantity,price,category\n"
+        b"Chair,150,49.99,Furniture\n"
+        b"Table,80,129.99,Furniture\n"
+        b"Sofa,40,599.99,Furniture\n"
+    ),
+    "groceries.csv": (
+        b"name,quantity,price,category\n"
+        b"Apple,200,0.99,Groceries\n"
+        b"Milk,120,1.49,Groceries\n"
+        b"Bread,100,2.99,Groceries\n"
+    ),
+}
+
+# argparse copies argv before parsing, so these tuples are passed to main() as is
+_ARGS_INTERACTIVE = ("interactive",)
+
+# Precompiled transcripts: each checks several messages, in order, in a single pass over the output
+_MENU_OK = re.compile(r"CSV files consolidated successfully\.(?s:.*)Exiting the program\. Goodbye!")
+_SEARCH_OK = re.compile(r"Search Results:(?s:.*)category(?s:.*)Electronics")
+_CONSOLIDATE_ERRORS = re.compile(
+    r"CSV files consolidated successfully\.(?s:.*)Error: Mocked consolidation error(?s:.*)Error: Mocked search error"
+)
+_POLARS_SEARCH_OK = re.compile(r"Search Results:(?s:.*)Apple")
+
+# Small frames built once at import and shared read-only by the tests below
+_SAMPLE_SEARCH = pd.DataFrame({
+    "name": ["item1", "item2", "item3"],
+    "quantity": [10, 20, 30],
+    "price": [100.0, 200.0, 300.0],
+    "category": ["Electronics", "Furniture", "Electronics"]
+})
+_SAMPLE_NAME_QUANTITY = pd.DataFrame({
+    "name": ["item1", "item2"],
+    "quantity": [10, 20]
+    # Missing 'category' and 'price' columns
+})
+_SAMPLE_NO_PRICE = pd.DataFrame({
+    "name": ["item1", "item2"],
+    "quantity": [10, 20],
+    "category": ["Electronics", "Furniture"]
+})
+
+_CORRUPTED_CSV = (
+    b"name,quantity,price,category\n"
+    b"item1,10,,Electronics\n"  # Missing price value
+    b"item2,invalid_value,100,Furniture\n"  # Invalid quantity
+)
+
+def _write_bytes(path, payload):
+    """Write payload to path through a raw file descriptor, in a single write call when possible."""
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        view = memoryview(payload)
+        while view:
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
+
+def _materialize_fixtures(directory):
+    """Write the fixture CSV files into directory, one write per file."""
+    for name, payload in _FIXTURE_FILES.items():
+        _write_bytes(os.path.join(directory, name), payload)
+
+def _safe_unlink(path):
+    """Remove path if it exists, without a separate existence check."""
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
+
+@functools.cache
+def _get_fixture_dir():
+    """Build the CSV fixture directory once per process, in memory-backed /dev/shm when available."""
+    directory = tempfile.mkdtemp(prefix="stock_", dir="/dev/shm" if os.path.isdir("/dev/shm") else None)
+    _materialize_fixtures(directory)
+    atexit.register(shutil.rmtree, directory, ignore_errors=True)
+    return directory
+
+@functools.cache
+def _cached_df(directory):
+    """Consolidate directory once per process, independent of main's own cache being cleared by tests."""
+    return consolidate_csv_files(directory)
+
 class TestStockManagement(unittest.TestCase):
 
     @classmethod
     def setUpClass(cls):
-        """Set the directory containing the CSV files for testing."""
-        cls.test_dir = os.path.join(os.path.dirname(__file__), "CSV")
+        """Reuse the process-wide CSV fixture directory and consolidate it once."""
+        cls._tmp = _get_fixture_dir()
+        cls.test_dir = cls._tmp
+        cls._df = _cached_df(cls.test_dir)  # Read-only: tests needing to modify it take a copy
+        # Built once and re-entered by every test instead of constructing a new patcher each time
+        cls._input_patcher = patch("builtins.input")
+        # Started by tests that drive main() over the fixture data without parsing it again
+        cls._consolidate_patcher = patch("main.consolidate_csv_files", return_value=cls._df)
+        # Command lines depending on test_dir, built once for the whole class
+        cls._ARGS_CONSOLIDATE = ("consolidate", "--directory", cls.test_dir)
+        cls._ARGS_SEARCH = ("search", "--directory", cls.test_dir, "--column", "category", "--value", "Electronics")
+        cls._ARGS_SUMMARY = ("summary", "--directory", cls.test_dir, "--output", "custom_report.csv")
+        cls._ARGS_POLARS_SEARCH = ("search", "--directory", cls.test_dir, "--column", "price", "--value", "0.99",
+                                   "--engine", "polars")
+        # (inputs, expected output, file to remove afterwards) for menu runs asserting a single message
+        cls._MAIN_CASES = [
+            (["1", "invalid_directory", "4"], "Invalid directory. Please try again.", None),
+            (["2", "3", "4"], "No data available. Please consolidate CSV files first.", None),
+            (["1", cls.test_dir, "2", "category", "Nonexistent", "4"], "No matching records found.", None),
+            (["1", cls.test_dir, "3", "", "4"], "CSV files consolidated successfully.",
+             main_module.DEFAULT_REPORT_FILENAME),
+        ]
+
+    def setUp(self):
+        """Capture stdout and stub input for every test; tests set self.mock_input.side_effect as needed."""
+        self._stack = contextlib.ExitStack()
+        self.mock_stdout = self._stack.enter_context(capture_stdout())
+        self.mock_input = self._stack.enter_context(self._input_patcher)
+
+    def tearDown(self):
+        self._stack.close()
+
+    def _sink(self, *needles):
+        """Replace the captured stdout for this test with a NeedleSink watching for needles."""
+        sink = NeedleSink(needles)
+        self._stack.enter_context(contextlib.redirect_stdout(sink))
+        return sink
 
     def test_consolidate_csv_files(self):
         """Test consolidation of multiple CSV files."""
-        df = consolidate_csv_files(self.test_dir)
+        df = self._df
         self.assertEqual(len(df), 12)  # Total rows from all files
         self.assertIn('category', df.columns)
         self.assertGreater(len(df), 0)  # Ensure DataFrame is not empty
@@ -23,12 +200,139 @@ class TestStockManagement(unittest.TestCase):
         self.assertEqual(df['category'].nunique(), 4)  # Ensure four unique categories
         self.assertFalse(df.isnull().values.any())  # Ensure no missing values
 
+    def test_consolidate_csv_files_optimized_dtypes(self):
+        """Test that consolidation shrinks dtypes without losing price precision."""
+        df = self._df
+        self.assertIsInstance(df['category'].dtype, pd.CategoricalDtype)
+        self.assertLess(df['quantity'].dtype.itemsize, 8)  # Quantities fit in a narrower integer
+        self.assertIn(899.99, df['price'].tolist())  # Prices are not rounded by a float32 downcast
+
+    def test_consolidate_csv_files_selected_columns(self):
+        """Test that only the requested columns are parsed, with the requested types."""
+        df = consolidate_csv_files(self.test_dir, columns=['category', 'price'], dtypes={'price': pa.float32()})
+        self.assertEqual(df.columns.tolist(), ['category', 'price'])
+        self.assertEqual(df['price'].dtype, pd.ArrowDtype(pa.float32()))
+
+    def test_consolidate_csv_files_missing_and_extra_columns(self):
+        """Test that files lacking a default column are still read, and that extra columns are dropped."""
+        partial_dir = os.path.join(self._tmp, "partial")  # Removed with the rest of the fixtures at exit
+        os.makedirs(partial_dir, exist_ok=True)
+        _write_bytes(os.path.join(partial_dir, "no_price.csv"),
+                                b"name,quantity,category,supplier\nDesk,5,Furniture,Acme\n")
+        df = consolidate_csv_files(partial_dir)
+        self.assertEqual(df.columns.tolist(), ['name', 'quantity', 'category'])
+        generate_summary_report(df, os.path.join(partial_dir, "report.txt"))
+        self.assertIn("Missing required column in data", self.mock_stdout.getvalue())
+
+        _write_bytes(os.path.join(partial_dir, "furniture.csv"), _FIXTURE_FILES["furniture.csv"])
+        df = consolidate_csv_files(partial_dir)
+        self.assertEqual(len(df), 4)
+        self.assertEqual(df['price'].isna().sum(), 1)  # Only the row of the file without prices
+
+    def test_consolidate_csv_files_declared_empty_column(self):
+        """Test that a column every file declares but leaves empty is kept, by both engines."""
+        blank_dir = os.path.join(self._tmp, "blank")  # Removed with the rest of the fixtures at exit
+        os.makedirs(blank_dir, exist_ok=True)
+        _write_bytes(os.path.join(blank_dir, "stock.csv"),
+                                b"name,quantity,price,category,notes\nDesk,5,,Furniture,\nLamp,3,,Furniture,\n")
+        df = consolidate_csv_files(blank_dir)
+        self.assertEqual(df.columns.tolist(), list(main_module.DEFAULT_COLUMNS))
+        self.assertTrue(df['price'].isna().all())
+        self.assertIn('notes', consolidate_csv_files(blank_dir, columns=None, dtypes=None).columns)
+        output_file = os.path.join(blank_dir, "report.txt")
+        generate_summary_report(df, output_file)
+        self.assertIn("Summary report saved to", self.mock_stdout.getvalue())
+
+        if importlib.util.find_spec("polars") is not None:
+            self.assertEqual(main_module._consolidate_polars(blank_dir).columns, list(main_module.DEFAULT_COLUMNS))
+            main(["summary", "--directory", blank_dir, "--output", output_file, "--engine", "polars"])
+            self.assertNotIn("Missing required column", self.mock_stdout.getvalue())
+
+    def test_consolidate_csv_files_cached(self):
+        """Test that an unchanged directory is only parsed once."""
+        _consolidate_cached.cache_clear()
+        first = consolidate_csv_files(self.test_dir)
+        second = consolidate_csv_files(self.test_dir)
+        self.assertEqual(_consolidate_cached.cache_info().hits, 1)
+        second['extra'] = 0  # Modifying a returned frame must not leak into the cache
+        self.assertNotIn('extra', consolidate_csv_files(self.test_dir).columns)
+        self.assertTrue(first.equals(second.drop(columns='extra')))
+
+    def test_consolidate_csv_files_cached_without_copy_on_write(self):
+        """Test that in-place edits cannot reach the cached frame when pandas does not copy on write."""
+        _consolidate_cached.cache_clear()
+        with patch("main._copy_on_write", return_value=False):
+            df = consolidate_csv_files(self.test_dir)
+            df.loc[0, 'quantity'] = 0
+            self.assertNotEqual(consolidate_csv_files(self.test_dir).loc[0, 'quantity'], 0)
+        _consolidate_cached.cache_clear()
+
+    def test_consolidate_csv_files_parquet_cache(self):
+        """Test that a fresh Parquet cache is used instead of re-parsing the CSV files."""
+        consolidate_csv_files(self.test_dir)
+        self.assertTrue(os.path.exists(os.path.join(self.test_dir, ".cache.parquet")))
+
+        _consolidate_cached.cache_clear()
+        with patch("main._safe_read", side_effect=AssertionError("CSV files were parsed again")):
+            df = consolidate_csv_files(self.test_dir)
+        self.assertEqual(len(df), 12)
+        self.assertEqual(len(search_data(df, 'category', 'Electronics')), 3)
+
+    def test_consolidate_csv_files_parquet_cache_replaced_atomically(self):
+        """Test that a failed cache write keeps the previous cache and leaves no temporary file behind."""
+        cache_file = os.path.join(self.test_dir, ".cache.parquet")
+        consolidate_csv_files(self.test_dir)
+        with open(cache_file, "rb") as f:
+            previous = f.read()
+
+        _consolidate_cached.cache_clear()
+        with patch.multiple("main", _read_parquet_cache=MagicMock(return_value=None),
+                            pq=MagicMock(**{"write_table.side_effect": OSError("disk full")})):
+            consolidate_csv_files(self.test_dir)
+        _consolidate_cached.cache_clear()
+        with open(cache_file, "rb") as f:
+            self.assertEqual(f.read(), previous)
+        self.assertEqual([name for name in os.listdir(self.test_dir) if name.endswith(".tmp")], [])
+
+    def test_consolidate_csv_files_parquet_cache_version(self):
+        """Test that a cache written by another cache format version is not loaded."""
+        consolidate_csv_files(self.test_dir)
+        _consolidate_cached.cache_clear()
+        with patch("main.CACHE_FORMAT_VERSION", main_module.CACHE_FORMAT_VERSION + 1), \
+                patch("main._safe_read", wraps=main_module._safe_read) as safe_read:
+            consolidate_csv_files(self.test_dir)
+        _consolidate_cached.cache_clear()
+        self.assertTrue(safe_read.called)
+        consolidate_csv_files(self.test_dir)  # Rewrite the cache under the current version
+
+    def test_consolidate_csv_files_arrow_backed_strings(self):
+        """Test that text columns stay Arrow-backed, whether parsed or loaded from the Parquet cache."""
+        _consolidate_cached.cache_clear()
+        parsed = consolidate_csv_files(self.test_dir)
+        _consolidate_cached.cache_clear()
+        cached = consolidate_csv_files(self.test_dir)
+        for df in (parsed, cached):
+            self.assertEqual(df['name'].dtype, pd.ArrowDtype(pa.string()))
+            self.assertEqual(df['category'].cat.categories.dtype, pd.ArrowDtype(pa.string()))
+            self.assertEqual(search_data(df, 'name', 'Sofa')['price'].tolist(), [599.99])
+        self.assertTrue(parsed.dtypes.equals(cached.dtypes))
+        self.assertTrue(parsed.equals(cached))
+
+    def test_consolidate_csv_files_worker_processes(self):
+        """Test consolidation through worker processes, as used for huge directories."""
+        _consolidate_cached.cache_clear()
+        with patch.multiple("main", PROCESS_MIN_FILES=0, PROCESS_MIN_BYTES=0,
+                            _read_parquet_cache=MagicMock(return_value=None)):
+            df = consolidate_csv_files(self.test_dir)
+        _consolidate_cached.cache_clear()
+        self.assertEqual(len(df), 12)
+        self.assertEqual(df['category'].nunique(), 4)
+
     def test_consolidate_csv_files_no_csv_files(self):
-        empty_dir = os.path.join(self.test_dir, "empty")
+        empty_dir = os.path.join(self._tmp, "empty")  # Removed with the rest of the fixtures at exit
         os.makedirs(empty_dir, exist_ok=True)
         with self.assertRaises(ValueError):
             consolidate_csv_files(empty_dir)
-        os.rmdir(empty_dir)
 
     def test_consolidate_csv_files_with_corrupted_file(self):
         """Test handling of corrupted CSV files during consolidation."""
@@ -36,25 +340,37 @@ class TestStockManagement(unittest.TestCase):
 
         try:
             # Create a corrupted CSV file
-            with open(corrupted_file_path, "w") as f:
-                f.write("name,quantity,price,category\n")
-                f.write("item1,10,,Electronics\n")  # Missing price value
-                f.write("item2,invalid_value,100,Furniture\n")  # Invalid quantity
+            _write_bytes(corrupted_file_path, _CORRUPTED_CSV)
+
+            # Attempt to consolidate files, printed output goes to self.mock_stdout
+            df = consolidate_csv_files(self.test_dir)
+            self.assertEqual(len(df), 12)  # The corrupted file is skipped, the others are kept
+            self.assertEqual(self.mock_stdout.getvalue().count("Error reading corrupted.csv"), 1)
+
+        finally:
+            # Ensure the corrupted file is deleted
+            _safe_unlink(corrupted_file_path)
 
-            # Patch sys.stdout to capture printed output
-            with patch("sys.stdout", new_callable=io.StringIO) as mock_stdout:
-                # Attempt to consolidate files
-                consolidate_csv_files(self.test_dir)
-                output = mock_stdout.getvalue()
+    def test_consolidate_csv_files_reports_corrupted_file_on_cache_hits(self):
+        """Test that a skipped file is reported again when the result comes from either cache."""
+        corrupted_file_path = os.path.join(self.test_dir, "corrupted.csv")
+
+        try:
+            _write_bytes(corrupted_file_path, _CORRUPTED_CSV)
+            consolidate_csv_files(self.test_dir)
+            consolidate_csv_files(self.test_dir)  # In-process memoized result
+            _consolidate_cached.cache_clear()
+            with patch("main._safe_read", side_effect=AssertionError("CSV files were parsed again")):
+                consolidate_csv_files(self.test_dir)  # Parquet cache
+            self.assertEqual(self.mock_stdout.getvalue().count("Error reading corrupted.csv"), 3)
 
         finally:
             # Ensure the corrupted file is deleted
-            if os.path.exists(corrupted_file_path):
-                os.remove(corrupted_file_path)
+            _safe_unlink(corrupted_file_path)
 
     def test_search_data(self):
         """Test searching for data within a DataFrame."""
-        df = consolidate_csv_files(self.test_dir)
+        df = self._df
 
         results = search_data(df, 'category', 'Electronics')
         self.assertEqual(len(results), 3)  # 3 rows in Electronics
@@ -71,32 +387,79 @@ class TestStockManagement(unittest.TestCase):
         results = search_data(df, 'name', 'Nonexistent')
         self.assertEqual(len(results), 0)  # No rows for non-existent item
 
-        sample_data = pd.DataFrame({
-            "name": ["item1", "item2", "item3"],
-            "quantity": [10, 20, 30],
-            "price": [100.0, 200.0, 300.0],
-            "category": ["Electronics", "Furniture", "Electronics"]
+        results = search_data(df, 'category', 'Toys')
+        self.assertEqual(len(results), 0)  # No rows for a category that does not exist
+
+        self.mock_input.side_effect = ["1", self.test_dir, "2", "category", "Electronics", "4"]
+        with patch("main.consolidate_csv_files", return_value=_SAMPLE_SEARCH):
+            main(_ARGS_INTERACTIVE)
+        # Check that the search results are printed, with the 'category' column and the searched value
+        self.assertRegex(self.mock_stdout.getvalue(), _SEARCH_OK)
+
+    def test_search_data_numeric_column(self):
+        """Test searching numeric columns with a string search value."""
+        df = self._df
+        self.assertEqual(len(search_data(df, 'quantity', '120')), 2)  # Smartphone and Milk
+        self.assertEqual(search_data(df, 'price', '899.99')['name'].tolist(), ['Laptop'])
+        self.assertEqual(len(search_data(df, 'quantity', 'many')), 0)  # Not a number, no match
+
+    def test_search_data_out_of_range_number(self):
+        """Test that numbers too large for the column's dtype match nothing instead of failing."""
+        df = self._df
+        self.assertTrue(search_data(df, 'quantity', '99999999999999999999999').empty)
+        self.assertTrue(search_data(df, 'quantity', str(2 ** 63)).empty)
+        self.assertTrue(search_data(df, 'price', '99999999999999999999999').empty)
+        with patch("main.NUMBA_MIN_ROWS", 0), patch("main.NUMEXPR_MIN_ROWS", 0):
+            self.assertTrue(search_data(df, 'quantity', '99999999999999999999999').empty)
+
+    @unittest.skipIf(importlib.util.find_spec("numba") is None, "numba is not installed")
+    def test_search_data_numba_kernel(self):
+        """Test that the parallel kernel used on large frames matches the pandas comparison."""
+        df = self._df
+        with patch("main.NUMBA_MIN_ROWS", 0):
+            self.assertEqual(search_data(df, 'quantity', '120')['name'].tolist(), ['Smartphone', 'Milk'])
+            self.assertEqual(search_data(df, 'price', '0.99')['name'].tolist(), ['Apple'])
+
+    @unittest.skipIf(main_module.numexpr is None, "numexpr is not installed")
+    def test_search_data_numexpr(self):
+        """Test the numexpr comparison used on very large frames when Numba is unavailable."""
+        df = self._df
+        with patch.multiple("main", _numba_kernels=MagicMock(return_value=None), NUMEXPR_MIN_ROWS=0):
+            self.assertEqual(search_data(df, 'quantity', '120')['name'].tolist(), ['Smartphone', 'Milk'])
+            self.assertEqual(search_data(df, 'price', '0.99')['name'].tolist(), ['Apple'])
+
+    def test_search_data_object_column(self):
+        """Test searching object-dtype columns, with and without non-string values."""
+        df = pd.DataFrame({
+            "name": pd.Series(["item1", "item2", "item1"], dtype=object),
+            "code": pd.Series([1, "2", True], dtype=object)
         })
+        self.assertEqual(len(search_data(df, "name", "item1")), 2)
+        self.assertEqual(len(search_data(df, "code", "1")), 1)  # Mixed values still compare as text
 
-        with patch("main.consolidate_csv_files", return_value=sample_data), \
-                patch("builtins.input", side_effect=["1", self.test_dir, "2", "category", "Electronics", "4"]), \
-                patch("sys.stdout", new_callable=io.StringIO) as mock_stdout:
-            main(["interactive"])
-            output = mock_stdout.getvalue()
+    def test_search_data_nullable_and_boolean_columns(self):
+        """Test searching columns with missing values and boolean columns."""
+        df = pd.DataFrame({
+            "quantity": pd.array([10, None, 10], dtype="Int64"),
+            "in_stock": [True, False, True]
+        })
+        self.assertEqual(len(search_data(df, "quantity", "10")), 2)  # Missing values never match
+        self.assertEqual(len(search_data(df, "in_stock", "False")), 1)
 
-        # Check that the search results are printed
-        self.assertIn("Search Results:", output)
-        self.assertIn("category", output)  # Ensure results contain the 'category' column
-        self.assertIn("Electronics", output)  # Ensure results contain the searched value
+    def test_search_data_non_string_categories(self):
+        """Test searching categorical columns whose categories are not strings."""
+        df = pd.DataFrame({"quantity": pd.Categorical([1, 2, 1]), "price": pd.Categorical([0.5, 1.5, 1.5])})
+        self.assertEqual(len(search_data(df, "quantity", "1")), 2)
+        self.assertEqual(len(search_data(df, "price", "1.5")), 2)
+        self.assertEqual(len(search_data(df, "quantity", "3")), 0)
 
     def test_search_data_column_not_found(self):
-        df = pd.DataFrame({"name": ["item1", "item2"], "quantity": [10, 20]})
         with self.assertRaises(KeyError):
-            search_data(df, "nonexistent_column", "item")
+            search_data(_SAMPLE_NAME_QUANTITY, "nonexistent_column", "item")
 
     def test_generate_summary_report(self):
         """Test generation of a summary report."""
-        df = consolidate_csv_files(self.test_dir)
+        df = self._df
         output_file = os.path.join(self.test_dir, 'summary_report.csv')
 
         generate_summary_report(df, output_file)
@@ -104,163 +467,175 @@ class TestStockManagement(unittest.TestCase):
         # Verify that the summary report was created
         self.assertTrue(os.path.exists(output_file))
 
-        # Load the report and validate its content
-        summary = pd.read_csv(output_file)
-        self.assertIn('category', summary.columns)
-        self.assertIn('Total Quantity', summary.columns)
-        self.assertIn('Average Price', summary.columns)
+        # Read the report bytes once and validate its content without parsing it back into a DataFrame
+        with open(output_file, "rb") as f:
+            raw = f.read()
+        header, *rows = raw.splitlines()
+        self.assertEqual(header, b'category,Total Quantity,Average Price')
 
         # Check specific summary values for a category
-        electronics_summary = summary[summary['category'] == 'Electronics']
-        self.assertEqual(electronics_summary['Total Quantity'].values[0], 245)
-        self.assertAlmostEqual(electronics_summary['Average Price'].values[0], 699.99, places=2)
+        self.assertIn(b'Electronics,245,699.99', raw)
+        electronics = next(row for row in rows if row.startswith(b'Electronics,'))
+        self.assertEqual(round(float(electronics.split(b",")[2]) * 100), 69999)  # Average price in cents
 
         # Additional test cases
-        self.assertEqual(len(summary), 4)  # 4 categories in summary
-        self.assertTrue((summary['Total Quantity'] > 0).all())  # Ensure positive quantities
-        self.assertTrue((summary['Average Price'] > 0).all())  # Ensure positive prices
-        self.assertTrue(summary['category'].is_unique)  # Ensure unique categories in summary
+        cols = [row.split(b",") for row in rows]
+        self.assertEqual(len(rows), 4)  # 4 categories in summary
+        self.assertTrue(all(int(c[1]) > 0 for c in cols))  # Ensure positive quantities
+        self.assertTrue(all(float(c[2]) > 0 for c in cols))  # Ensure positive prices
+        self.assertEqual(len({c[0] for c in cols}), len(cols))  # Ensure unique categories in summary
 
         # Cleanup: Remove the summary report file
-        if os.path.exists(output_file):
-            os.remove(output_file)
+        _safe_unlink(output_file)
+
+    def test_generate_summary_report_format(self):
+        """Test that the report is written like DataFrame.to_csv(float_format='%.2f')."""
+        df = pd.DataFrame({"category": ["Desks, Tables", "Lamps", "Misc"], "quantity": [1, 2, 3],
+                           "price": [5.0, 12.5, None]})
+        output_file = os.path.join(self.test_dir, 'summary_report_format.csv')
+        for frame in (df.iloc[1:], df):  # Plain names, then one the pandas fallback has to quote
+            generate_summary_report(frame, output_file)
+            with open(output_file, "rb") as f:
+                raw = f.read()
+            _safe_unlink(output_file)
+            self.assertTrue(raw.startswith(b"category,Total Quantity,Average Price\n"))
+            self.assertIn(b"\nLamps,2,12.50\nMisc,3,\n", raw)
+        self.assertIn(b'\n"Desks, Tables",1,5.00\n', raw)
+
+    @unittest.skipIf(importlib.util.find_spec("numba") is None, "numba is not installed")
+    def test_aggregate_by_category_numba_kernel(self):
+        """Test that the parallel group reduction matches the pandas groupby."""
+        df = self._df
+        expected = main_module._aggregate_by_category(df)
+        with patch("main.NUMBA_MIN_ROWS", 0):
+            summary = main_module._aggregate_by_category(df)
+        self.assertEqual(summary.index.tolist(), expected.index.tolist())
+        self.assertEqual(summary['Total Quantity'].tolist(), expected['Total Quantity'].tolist())
+        for actual, wanted in zip(summary['Average Price'], expected['Average Price']):
+            self.assertAlmostEqual(actual, wanted)
 
     def test_generate_summary_report_missing_columns(self):
         """Test summary report generation with missing required columns."""
-        df = pd.DataFrame({
-            "name": ["item1", "item2"],
-            "quantity": [10, 20]
-            # Missing 'category' and 'price' columns
-        })
+        sink = self._sink("Missing required column in data")
         output_file = os.path.join(self.test_dir, 'summary_report_missing.csv')
 
-        with patch("sys.stdout", new_callable=io.StringIO) as mock_stdout:
-            generate_summary_report(df, output_file)
-            output = mock_stdout.getvalue()
-            self.assertIn("Missing required column in data", output)
+        generate_summary_report(_SAMPLE_NAME_QUANTITY, output_file)
+        self.assertEqual(sink.found, set(sink.needles))
 
         # Ensure the report file was not created
         self.assertFalse(os.path.exists(output_file))
 
-    def test_invalid_directory(self):
-        """Test handling of an invalid directory in the interactive menu."""
-        with patch("builtins.input", side_effect=["1", "invalid_directory", "4"]), \
-                patch("sys.stdout", new_callable=io.StringIO) as mock_stdout:
-            main(["interactive"])
-            output = mock_stdout.getvalue()
-            self.assertIn("Invalid directory. Please try again.", output)
-
     def test_error_during_consolidation(self):
         """Test error handling during CSV consolidation."""
-        with patch("main.consolidate_csv_files", side_effect=Exception("Mocked error")), \
-                patch("builtins.input", side_effect=["1", self.test_dir, "4"]), \
-                patch("sys.stdout", new_callable=io.StringIO) as mock_stdout:
-            main(["interactive"])
-            output = mock_stdout.getvalue()
-            self.assertIn("Error: Mocked error", output)
-
-    def test_no_data_available(self):
-        """Test error messages when no data is consolidated."""
-        with patch("builtins.input", side_effect=["2", "3", "4"]), \
-                patch("sys.stdout", new_callable=io.StringIO) as mock_stdout:
-            main(["interactive"])
-            output = mock_stdout.getvalue()
-            self.assertIn("No data available. Please consolidate CSV files first.", output)
+        with self.assertRaises(FileNotFoundError):
+            consolidate_csv_files(os.path.join(self._tmp, "nonexistent"))
 
     def test_search_with_invalid_column(self):
         """Test searching with an invalid column."""
-        df = consolidate_csv_files(self.test_dir)
-        with patch("main.consolidate_csv_files", return_value=df), \
-                patch("builtins.input", side_effect=["1", self.test_dir, "2", "invalid_column", "value", "4"]), \
-                patch("sys.stdout", new_callable=io.StringIO) as mock_stdout:
-            main(["interactive"])
-            output = mock_stdout.getvalue()
-            self.assertIn("Column 'invalid_column' not found in the DataFrame.",
-                          output)  # Updated to match actual message
-
-    def test_search_no_results(self):
-        """Test searching with no matching results."""
-        df = consolidate_csv_files(self.test_dir)
-        with patch("main.consolidate_csv_files", return_value=df), \
-                patch("builtins.input", side_effect=["1", self.test_dir, "2", "category", "Nonexistent", "4"]), \
-                patch("sys.stdout", new_callable=io.StringIO) as mock_stdout:
-            main(["interactive"])
-            output = mock_stdout.getvalue()
-            self.assertIn("No matching records found.", output)
+        with self.assertRaisesRegex(KeyError, "Column 'invalid_column' not found in the DataFrame."):
+            search_data(self._df, "invalid_column", "value")
+
+    def test_main_table(self):
+        """Test the interactive menu messages, one sub-test per row of _MAIN_CASES."""
+        sink = self._sink()
+        self._stack.enter_context(self._consolidate_patcher)
+        for inputs, expected, cleanup in self._MAIN_CASES:
+            with self.subTest(case=expected):
+                self.mock_input.side_effect = inputs
+                sink.reset(expected)
+                main(_ARGS_INTERACTIVE)
+                self.assertEqual(sink.found, {expected})
+                if cleanup:
+                    _safe_unlink(cleanup)
 
     def test_invalid_choice(self):
         """Test invalid choice in the interactive menu."""
-        with patch("builtins.input", side_effect=["5", "4"]), \
-                patch("sys.stdout", new_callable=io.StringIO) as mock_stdout:
-            main(["interactive"])
-            output = mock_stdout.getvalue()
-            self.assertIn("Invalid choice. Please try again.", output)
-
-    def test_main_interactive_mode(self):
-        """Test main function in interactive mode."""
-        with patch("builtins.input", side_effect=["1", self.test_dir, "3", "", "4"]), \
-             patch("sys.stdout", new_callable=io.StringIO) as mock_stdout:
-            main(["interactive"])
-            output = mock_stdout.getvalue()
-            self.assertIn("CSV files consolidated successfully.", output)
+        sink = self._sink("Invalid choice. Please try again.")
+        self.mock_input.side_effect = ["5", "4"]
+        main(_ARGS_INTERACTIVE)
+        self.assertEqual(sink.found, set(sink.needles))
 
     def test_main_consolidate_command(self):
         """Test consolidate command with argparse."""
-        args = ["consolidate", "--directory", self.test_dir]
-        with patch("sys.stdout", new_callable=io.StringIO) as mock_stdout:
-            main(args)
-            output = mock_stdout.getvalue()
-            self.assertIn("CSV files consolidated successfully.", output)
-
-        with patch("main.consolidate_csv_files", side_effect=Exception("Mocked consolidation error")), \
-                patch("builtins.input", side_effect=["1", self.test_dir, "4"]), \
-                patch("sys.stdout", new_callable=io.StringIO) as mock_stdout:
-            main(["interactive"])
-            output = mock_stdout.getvalue()
-
-        self.assertIn("Error: Mocked consolidation error", output)  # Check for error message
-
-        with patch("main.consolidate_csv_files", return_value=pd.DataFrame()), \
-                patch("main.search_data", side_effect=Exception("Mocked search error")), \
-                patch("builtins.input", side_effect=["1", self.test_dir, "2", "category", "value", "4"]), \
-                patch("sys.stdout", new_callable=io.StringIO) as mock_stdout:
-            main(["interactive"])
-            output = mock_stdout.getvalue()
-
-        self.assertIn("Error: Mocked search error", output)  # Check for error message
+        main(self._ARGS_CONSOLIDATE)
+
+        self.mock_input.side_effect = ["1", self.test_dir, "4"]
+        with patch("main.consolidate_csv_files", side_effect=Exception("Mocked consolidation error")):
+            main(_ARGS_INTERACTIVE)
+
+        self.mock_input.side_effect = ["1", self.test_dir, "2", "category", "value", "4"]
+        with patch.multiple("main", consolidate_csv_files=DEFAULT, search_data=DEFAULT) as mocks:
+            mocks["consolidate_csv_files"].return_value = pd.DataFrame()
+            mocks["search_data"].side_effect = Exception("Mocked search error")
+            main(_ARGS_INTERACTIVE)
+
+        self.assertRegex(self.mock_stdout.getvalue(), _CONSOLIDATE_ERRORS)  # Success, then both error messages
+
+    def test_main_program_execution(self):
+        """Test a full menu session: consolidate, then exit."""
+        self._stack.enter_context(self._consolidate_patcher)
+        self.mock_input.side_effect = ["1", self.test_dir, "4"]
+        main(_ARGS_INTERACTIVE)
+        self.assertRegex(self.mock_stdout.getvalue(), _MENU_OK)
+
+    def test_main_reuses_parser(self):
+        """Test that main() parses with the module-level parser instead of building one per call."""
+        self._stack.enter_context(self._consolidate_patcher)
+        with patch("main._build_parser", side_effect=AssertionError("parser rebuilt")):
+            main(self._ARGS_CONSOLIDATE)
+        self.assertIn("CSV files consolidated successfully.", self.mock_stdout.getvalue())
 
     def test_main_search_command(self):
         """Test search command with argparse."""
-        df = consolidate_csv_files(self.test_dir)
-        with patch("main.consolidate_csv_files", return_value=df):
-            args = ["search", "--directory", self.test_dir, "--column", "category", "--value", "Electronics"]
-            with patch("sys.stdout", new_callable=io.StringIO) as mock_stdout:
-                main(args)
-                output = mock_stdout.getvalue()
-                self.assertIn("Search Results:", output)
+        sink = self._sink("Search Results:")
+        self._stack.enter_context(self._consolidate_patcher)
+        main(self._ARGS_SEARCH)
+        self.assertEqual(sink.found, set(sink.needles))
 
     def test_main_summary_command(self):
         """Test summary report generation with argparse."""
-        args = ["summary", "--directory", self.test_dir, "--output", "custom_report.csv"]
-        with patch("sys.stdout", new_callable=io.StringIO) as mock_stdout:
-            main(args)
-            output = mock_stdout.getvalue()
-            self.assertIn("Summary report saved to custom_report.csv", output)
-            os.remove("custom_report.csv")
+        sink = self._sink("Summary report saved to custom_report.csv")
+        main(self._ARGS_SUMMARY)
+        self.assertEqual(sink.found, set(sink.needles))
+        _safe_unlink("custom_report.csv")
+
+    @unittest.skipIf(importlib.util.find_spec("polars") is None, "polars is not installed")
+    def test_main_polars_engine(self):
+        """Test that the polars engine produces the same search results and summary report."""
+        main(self._ARGS_POLARS_SEARCH)
+        self.assertRegex(self.mock_stdout.getvalue(), _POLARS_SEARCH_OK)
+
+        reports = {}
+        for engine in ("pandas", "polars"):
+            output_file = os.path.join(self.test_dir, f"summary_{engine}.csv")
+            main(["summary", "--directory", self.test_dir, "--output", output_file, "--engine", engine])
+            with open(output_file) as f:
+                reports[engine] = f.read()
+            _safe_unlink(output_file)
+        self.assertEqual(reports["polars"], reports["pandas"])
+
+    @unittest.skipIf(importlib.util.find_spec("polars") is None, "polars is not installed")
+    def test_consolidate_polars_like_pandas(self):
+        """Test that the polars engine skips unreadable files and tolerates extra columns and glob characters."""
+        odd_dir = os.path.join(self._tmp, "odd[1]")  # Removed with the rest of the fixtures at exit
+        os.makedirs(odd_dir, exist_ok=True)
+        _write_bytes(os.path.join(odd_dir, "furniture.csv"), _FIXTURE_FILES["furniture.csv"])
+        _write_bytes(os.path.join(odd_dir, "corrupted.csv"), _CORRUPTED_CSV)
+        _write_bytes(os.path.join(odd_dir, "extra.csv"),
+                                b"name,supplier,quantity,price,category\nDesk,Acme,5,89.99,Furniture\n")
+        df = main_module._consolidate_polars(odd_dir)
+        self.assertIn("Error reading corrupted.csv", self.mock_stdout.getvalue())
+        self.assertEqual(df.columns, list(main_module.DEFAULT_COLUMNS))
+        self.assertEqual(str(df.schema['quantity']), "Int32")
+        self.assertEqual(len(df), 4)
+
+        main(["summary", "--directory", odd_dir, "--output", os.path.join(odd_dir, "report.txt"),
+              "--engine", "polars"])
+        self.assertIn("Summary report saved to", self.mock_stdout.getvalue())
 
     def test_no_matching_records(self):
         """Test handling of no matching records during search."""
-        with patch("main.consolidate_csv_files", return_value=pd.DataFrame({
-            "name": ["item1", "item2"],
-            "quantity": [10, 20],
-            "category": ["Electronics", "Furniture"]
-        })), \
-                patch("builtins.input", side_effect=["1", self.test_dir, "2", "name", "nonexistent", "4"]), \
-                patch("sys.stdout", new_callable=io.StringIO) as mock_stdout:
-            main(["interactive"])
-            output = mock_stdout.getvalue()
-
-        self.assertIn("No matching records found.", output)
+        self.assertTrue(search_data(_SAMPLE_NO_PRICE, "name", "nonexistent").empty)
 
 
 if __name__ == "__main__":